@@ -1,42 +1,99 @@
 import socket
 
-def send_command(command, debug=True):
-    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    sock.connect(('localhost', 6379))
+def encode_command(*args):
+    buf = bytearray(b'*%d\r\n' % len(args))
+    for arg in args:
+        buf += b'$%d\r\n%s\r\n' % (len(arg), arg)
+    return bytes(buf)
+
+def reply_end(data, pos=0, limit=None):
+    # Offset just past the RESP reply starting at pos, or -1 if incomplete
+    if limit is None:
+        limit = len(data)
+    end = data.find(b'\r\n', pos, limit)
+    if end == -1:
+        return -1
+    kind = data[pos:pos + 1]
+    if kind == b'$':
+        length = int(data[pos + 1:end])
+        if length < 0:
+            return end + 2
+        end += length + 4
+        return end if end <= limit else -1
+    if kind == b'*':
+        count = int(data[pos + 1:end])
+        pos = end + 2
+        for _ in range(max(count, 0)):
+            pos = reply_end(data, pos, limit)
+            if pos == -1:
+                return -1
+        return pos
+    return end + 2
+
+_conn = None
+
+def get_connection():
+    # One connection is reused for every command the script sends
+    global _conn
+    if _conn is None:
+        _conn = socket.create_connection(('localhost', 6379), timeout=5)  # Longer timeout for debugging
+        _conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return _conn
+
+def close_connection():
+    global _conn
+    if _conn is not None:
+        _conn.close()
+        _conn = None
+
+def send_pipeline(commands, debug=False):
+    sock = get_connection()
     
     if debug:
-        print(f'Sending: {command}')
+        for command in commands:
+            print(f'Sending: {command}')
         
-    sock.send(command)
+    sock.sendall(b''.join(commands))
     
-    response = b''
-    sock.settimeout(5)  # Longer timeout for debugging
+    replies = []
+    buf = bytearray(16384)
+    have = 0
+    pos = 0
     try:
-        while True:
-            chunk = sock.recv(1024)
-            if not chunk:
+        while len(replies) < len(commands):
+            end = reply_end(buf, pos, have)
+            if end != -1:
+                replies.append(bytes(buf[pos:end]))
+                pos = end
+                continue
+            if have == len(buf):
+                buf.extend(bytes(len(buf)))  # Double the buffer once it fills up
+            received = sock.recv_into(memoryview(buf)[have:])
+            if not received:
                 if debug:
                     print('Connection closed')
+                close_connection()
                 break
             if debug:
-                print(f'Received chunk: {chunk}')
-            response += chunk
-            # Check if we got a complete response
-            if response.endswith(b'\r\n'):
-                break
+                print(f'Received chunk: {bytes(buf[have:have + received])}')
+            have += received
     except socket.timeout:
         if debug:
             print('Socket timeout')
+        # Unread replies would be mistaken for the next command's
+        close_connection()
         
-    sock.close()
-    return response
-
-print('Testing direct PING command...')
-ping_command = b'*1\r\n$4\r\nPING\r\n'
-response = send_command(ping_command)
-print(f'Direct PING Response: {response}\n')
-
-print('Testing Lua redis.call with PING command...')
-ping_script = b'*3\r\n$4\r\nEVAL\r\n$31\r\nreturn redis.call("PING")\r\n$1\r\n0\r\n'
-response = send_command(ping_script)
-print(f'EVAL PING Response: {response}\n')
+    # Keep any partial reply so it still shows up in the output
+    if pos < have:
+        replies.append(bytes(buf[pos:have]))
+    return replies
+
+ping_command = encode_command(b'PING')
+ping_script = encode_command(b'EVAL', b'return redis.call("PING")', b'0')
+
+print('Testing direct PING and Lua redis.call PING in one pipeline...')
+responses = send_pipeline([ping_command, ping_script])
+for label, response in zip(('Direct PING', 'EVAL PING'), responses):
+    print(f'{label} Response: {response}\n')
+
+close_connection()
@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
 
+import asyncio
 import redis
+import redis.asyncio as aioredis
 import time
 import threading
-from concurrent.futures import ThreadPoolExecutor
 
 # PASSWORD = 'mysecretpassword'
 
@@ -43,40 +44,44 @@ def run_concurrent_test(num_clients=10, pipeline_size=10):
     """Run concurrent clients test with pipelining"""
     print(f"\nConcurrent clients test ({num_clients} clients, {pipeline_size} pipeline size):")
     
-    def client_worker(client_id):
+    async def client_worker(client_id, pool):
         try:
-            client = redis.Redis(host='127.0.0.1', port=6379)
+            client = aioredis.Redis(connection_pool=pool)
             
             # Pipeline test for this client
-            pipeline = client.pipeline(transaction=False)
-            
-            # Add commands to the pipeline
-            for i in range(pipeline_size):
-                pipeline.set(f'client:{client_id}:key:{i}', f'value:{i}')
-                pipeline.get(f'client:{client_id}:key:{i}')
-            
-            # Execute the pipeline
-            results = pipeline.execute()
-            client.close()
-            
-            return all(r is not None and r != '' for r in results)
+            async with client.pipeline(transaction=False) as pipeline:
+                # Add commands to the pipeline
+                for i in range(pipeline_size):
+                    pipeline.set(f'client:{client_id}:key:{i}', f'value:{i}')
+                    pipeline.get(f'client:{client_id}:key:{i}')
+                
+                # Execute the pipeline
+                return await pipeline.execute()
         except Exception as e:
             print(f"Error in client {client_id}: {e}")
-            return False
+            return None
     
-    # Use thread pool to run concurrent clients
-    start_time = time.time()
-    with ThreadPoolExecutor(max_workers=num_clients) as executor:
-        futures = [executor.submit(client_worker, i) for i in range(num_clients)]
-        results = [future.result() for future in futures]
+    async def run_clients():
+        # Each client is a coroutine with its own pooled connection, all on one thread
+        pool = aioredis.ConnectionPool(host='127.0.0.1', port=6379, max_connections=num_clients)
+        try:
+            return await asyncio.gather(*[client_worker(i, pool) for i in range(num_clients)])
+        finally:
+            await pool.disconnect()
     
+    start_time = time.time()
+    results = asyncio.run(run_clients())
     end_time = time.time()
     
     # Calculate stats
     elapsed = end_time - start_time
     total_ops = num_clients * pipeline_size * 2  # Each pipeline has SET/GET pairs
     ops_per_sec = total_ops / elapsed
-    success_count = sum(results)
+    # Replies are checked only after the timed window has closed
+    success_count = sum(
+        1 for client_results in results
+        if client_results is not None and all(r is not None and r != '' for r in client_results)
+    )
     
     print(f"Total commands: {total_ops}")
     print(f"Time taken: {elapsed:.4f} seconds")
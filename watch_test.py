@@ -1,13 +1,25 @@
 import redis
+import sys
+
+# Everything draws from one pool. The WATCHing pipeline keeps its own
+# connection checked out, so the violating SET always gets a different one.
+POOL = redis.ConnectionPool(host='127.0.0.1', port=6379, max_connections=4)
 
 # Test WATCH mechanism with proper connection handling
-r = redis.Redis(host='127.0.0.1', port=6379, decode_responses=True)
+r = redis.Redis(connection_pool=POOL)
 print(f'Testing WATCH mechanism - Server PING: {r.ping()}')
 
-# Test 1: Normal transaction (should succeed)
-r.delete('watch_normal')
-r.set('watch_normal', 'initial')
+# Reset both test keys in one round trip
+setup = r.pipeline(transaction=False)
+setup.delete('watch_normal', 'watch_violation')
+setup.set('watch_normal', 'initial')
+setup.set('watch_violation', 'initial')
+setup.execute()
+
+# One transactional pipeline serves both tests; execute() resets it for reuse
 pipe = r.pipeline()
+
+# Test 1: Normal transaction (should succeed)
 pipe.watch('watch_normal')
 pipe.multi()
 pipe.set('watch_normal', 'updated')
@@ -16,16 +28,19 @@ final_value1 = r.get('watch_normal')
 print(f'Test 1 - Normal WATCH: result={result1}, final_value={final_value1}')
 
 # Test 2: Violation case (should abort)
-r.delete('watch_violation')
-r.set('watch_violation', 'initial')
-pipe = r.pipeline()
 pipe.watch('watch_violation')
 pipe.multi()
 pipe.set('watch_violation', 'transaction_value')
 
-# Cause violation from another connection
-r2 = redis.Redis(host='127.0.0.1', port=6379, decode_responses=True)
-r2.set('watch_violation', 'external_modification')
+# Cause violation from another connection, borrowed straight from the pool
+conn = POOL.get_connection()
+try:
+    conn.send_command('SET', 'watch_violation', 'external_modification')
+    reply = conn.read_response()
+    if reply != b'OK':
+        raise RuntimeError(f'Violating SET failed: {reply}')
+finally:
+    POOL.release(conn)
 
 # Execute (should abort)
 result2 = pipe.execute()
@@ -33,23 +48,21 @@ final_value2 = r.get('watch_violation')
 print(f'Test 2 - WATCH violation: result={result2}, final_value={final_value2}')
 
 # Summary
-if result1 == [True] and final_value1 == 'updated':
-    print('✅ Normal WATCH working correctly')
-    test1_pass = True
-else:
-    print(f'❌ Normal WATCH failed: expected [True] and "updated", got {result1} and {final_value1}')
-    test1_pass = False
+checks = [
+    ('Normal WATCH', ([True], b'updated'), (result1, final_value1)),
+    ('WATCH violation', (None, b'external_modification'), (result2, final_value2)),
+]
+failed = False
 
-if result2 is None and final_value2 == 'external_modification':
-    print('✅ WATCH violation detection working correctly')  
-    test2_pass = True
-else:
-    print(f'❌ WATCH violation failed: expected None and "external_modification", got {result2} and {final_value2}')
-    test2_pass = False
+for name, expected, actual in checks:
+    if actual == expected:
+        print(f'✅ {name} working correctly')
+    else:
+        print(f'❌ {name} failed: expected {expected[0]} and {expected[1]}, got {actual[0]} and {actual[1]}')
+        failed = True
 
-if test1_pass and test2_pass:
-    print('🎉 WATCH mechanism working correctly!')
-    exit(0)
-else:
+if failed:
     print('❌ WATCH mechanism has issues')
-    exit(1)
+else:
+    print('🎉 WATCH mechanism working correctly!')
+sys.exit(1 if failed else 0)